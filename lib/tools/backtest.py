@@ -1,22 +1,13 @@
 import numpy as np
 import pandas as pd
-import yfinance as yf
 import matplotlib.pyplot as plt
 from typing import Optional
 import io
 import base64
 
-import argparse 
-parser = argparse.ArgumentParser()
-parser.add_argument("--long_stocks", type=str, nargs="+", default=[])
-parser.add_argument("--short_stocks", type=str, nargs="+", default=[])
-parser.add_argument("--long_weights", type=int, nargs="+")
-parser.add_argument("--short_weights", type=int, nargs="+")
-parser.add_argument("--benchmark", type=str, default="^GSPC")
-parser.add_argument("--start_date", type=str, default="2023-01-01")
-parser.add_argument("--end_date", type=str, default="2024-01-01")
-parser.add_argument("--visualize", type=bool, default=True)
-args = parser.parse_args()
+from data_cache import cached_download
+
+import argparse
 
 
 class Backtest:
@@ -33,25 +24,31 @@ class Backtest:
     self.results = None
 
     if long_weights is None:
-      self.long_weights = [1/len(self.long_stocks) for _ in range(len(self.long_stocks))]
+      n = len(self.long_stocks)
+      self.long_weights = np.full(n, 1.0 / n) if n else np.array([])
     else:
-      self.long_weights = [w/sum(long_weights) for w in long_weights]
-      assert len(self.long_weights) == len(self.long_stocks), "Long weights must be the same length as long stocks"
-      assert sum(self.long_weights) == 1, "Long weights must sum to 1"
+      w = np.asarray(long_weights, dtype=np.float64)
+      w = w / w.sum()
+      assert w.size == len(self.long_stocks), "Long weights must be the same length as long stocks"
+      assert np.isclose(w.sum(), 1.0), "Long weights must sum to 1"
+      self.long_weights = w
 
     if short_weights is None:
-      self.short_weights = [1/len(self.short_stocks) for _ in range(len(self.short_stocks))]
+      n = len(self.short_stocks)
+      self.short_weights = np.full(n, 1.0 / n) if n else np.array([])
     else:
-      self.short_weights = [w/sum(short_weights) for w in short_weights]
-      assert len(self.short_weights) == len(self.short_stocks), "Short weights must be the same length as short stocks"
-      assert sum(self.short_weights) == 1, "Short weights must sum to 1"
+      w = np.asarray(short_weights, dtype=np.float64)
+      w = w / w.sum()
+      assert w.size == len(self.short_stocks), "Short weights must be the same length as short stocks"
+      assert np.isclose(w.sum(), 1.0), "Short weights must sum to 1"
+      self.short_weights = w
 
     self.start_date = start_date
     self.end_date = end_date
     self.benchmark = benchmark
   
   def fetch_data(self, tickers: list[str]) -> pd.DataFrame:
-    return yf.download(tickers, start=self.start_date, end=self.end_date)['Close']
+    return cached_download(tickers, self.start_date, self.end_date)
   
   def _check_results(self):
     if self.results is None:
@@ -71,7 +68,8 @@ class Backtest:
     
     # Save plot to base64 string
     buffer = io.BytesIO()
-    plt.savefig(buffer, format='png', bbox_inches='tight', dpi=300)
+    plt.savefig(buffer, format='png', bbox_inches='tight', dpi=150,
+                pil_kwargs={'optimize': True, 'compress_level': 6})
     buffer.seek(0)
     image_base64 = base64.b64encode(buffer.getvalue()).decode()
     plt.close()
@@ -80,24 +78,29 @@ class Backtest:
   
   def save_results(self):
     self._check_results()
-    self.results.to_csv("backtest.csv", index=False)
+    # float32 is ample precision for normalized returns and halves the size
+    self.results = self.results.astype(np.float32)
+    self.results.to_parquet("backtest.parquet", compression='zstd')
+    # The Node API route still parses the CSV, so keep writing it alongside;
+    # index=True preserves the date column that index=False used to drop
+    self.results.to_csv("backtest.csv", index=True, float_format='%.6f')
 
   def run(self):
+    # One batched download for every ticker instead of three separate calls
+    tickers = list(dict.fromkeys(self.long_stocks + self.short_stocks + [self.benchmark]))
+    prices = self.fetch_data(tickers)
+
     if self.long_stocks:
-      long_prices = self.fetch_data(self.long_stocks)
-      long_returns = long_prices / long_prices.shift(1) - 1
-      long_returns.iloc[0] = 0
-      long_portfolio_returns = (long_returns * self.long_weights).sum(axis=1)
+      long_returns = prices[self.long_stocks].pct_change().fillna(0.0)
+      long_portfolio_returns = pd.Series(long_returns.values @ self.long_weights,
+                                         index=long_returns.index)
 
     if self.short_stocks:
-      short_prices = self.fetch_data(self.short_stocks)
-      short_returns = short_prices / short_prices.shift(1) - 1
-      short_returns.iloc[0] = 0 
-      short_portfolio_returns = (short_returns * self.short_weights).sum(axis=1)
+      short_returns = prices[self.short_stocks].pct_change().fillna(0.0)
+      short_portfolio_returns = pd.Series(short_returns.values @ self.short_weights,
+                                          index=short_returns.index)
 
-    benchmark_prices = self.fetch_data([self.benchmark])[self.benchmark]
-    benchmark_returns = benchmark_prices / benchmark_prices.shift(1) - 1
-    benchmark_returns.iloc[0] = 0
+    benchmark_returns = prices[self.benchmark].pct_change().fillna(0.0)
             
     if self.long_stocks and self.short_stocks:
       strategy_returns = long_portfolio_returns - short_portfolio_returns 
@@ -121,7 +124,18 @@ class Backtest:
 
 
 if __name__ == "__main__":
-  backtest = Backtest(long_stocks=args.long_stocks, 
+  parser = argparse.ArgumentParser()
+  parser.add_argument("--long_stocks", type=str, nargs="+", default=[])
+  parser.add_argument("--short_stocks", type=str, nargs="+", default=[])
+  parser.add_argument("--long_weights", type=int, nargs="+")
+  parser.add_argument("--short_weights", type=int, nargs="+")
+  parser.add_argument("--benchmark", type=str, default="^GSPC")
+  parser.add_argument("--start_date", type=str, default="2023-01-01")
+  parser.add_argument("--end_date", type=str, default="2024-01-01")
+  parser.add_argument("--visualize", type=bool, default=True)
+  args = parser.parse_args()
+
+  backtest = Backtest(long_stocks=args.long_stocks,
                       short_stocks=args.short_stocks, 
                       long_weights=args.long_weights,
                       short_weights=args.short_weights,
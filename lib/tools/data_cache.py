@@ -0,0 +1,40 @@
+import hashlib
+import os
+import time
+
+import pandas as pd
+import yfinance as yf
+
+# Downloaded price data is cached on disk so repeat backtests/simulations
+# hit local files instead of Yahoo. Entries expire after a day since daily
+# closes are the finest granularity we use.
+CACHE_DIR = os.path.join(os.path.dirname(__file__), ".cache")
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+def _cache_path(tickers: list[str], start: str, end: str) -> str:
+  key = f"{','.join(sorted(tickers))}|{start}|{end}"
+  digest = hashlib.sha1(key.encode()).hexdigest()
+  return os.path.join(CACHE_DIR, f"{digest}.feather")
+
+
+def cached_download(tickers: list[str], start: str, end: str) -> pd.DataFrame:
+  """Fetch 'Close' prices via yf.download, memoized to a feather file on disk.
+
+  The cache key is the sorted ticker set plus the date range; entries older
+  than CACHE_TTL_SECONDS are refetched.
+  """
+  path = _cache_path(tickers, start, end)
+  if os.path.exists(path) and time.time() - os.path.getmtime(path) < CACHE_TTL_SECONDS:
+    return pd.read_feather(path).set_index("Date")
+
+  prices = yf.download(tickers, start=start, end=end)['Close']
+  if isinstance(prices, pd.Series):
+    prices = prices.to_frame()
+
+  # Only cache real data; a transient outage or bad ticker should not be
+  # served as an empty frame for the rest of the TTL
+  if not prices.empty and not prices.isna().all().all():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    prices.reset_index().to_feather(path, compression="zstd")
+  return prices
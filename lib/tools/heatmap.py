@@ -1,11 +1,66 @@
-import matplotlib.pyplot as plt 
-import squarify, numpy as np, pandas as pd 
+import os
+import time
+import matplotlib.pyplot as plt
+import squarify, numpy as np, pandas as pd
+import yfinance as yf
+from concurrent.futures import ThreadPoolExecutor
+
+def load_sp500_symbols():
+  # The constituent list changes at most quarterly; keep a week-old copy
+  # on disk rather than scraping Wikipedia on every call
+  path = ".cache/sp500_symbols.parquet"
+  if os.path.exists(path) and time.time() - os.path.getmtime(path) < 7 * 24 * 60 * 60:
+    return pd.read_parquet(path)['Symbol'].tolist()
+
+  sp500 = pd.read_html("https://en.wikipedia.org/wiki/List_of_S%26P_500_companies")[0]
+  os.makedirs(".cache", exist_ok=True)
+  sp500[['Symbol']].to_parquet(path)
+  return sp500['Symbol'].tolist()
+
+def get_sp500_data():
+  symbols = load_sp500_symbols()
+
+  # One batched download replaces 50 per-symbol history() round trips
+  prices = yf.download(symbols[:50], period='1mo', threads=True, progress=False)['Close']
+  prices = prices.dropna(axis=1, how='all')
+  returns = prices.ffill().iloc[-1] / prices.bfill().iloc[0] - 1
+
+  # fast_info hits a much lighter endpoint than the per-symbol .info scrape;
+  # it is still one HTTPS call per symbol, so fan those out over threads
+  tickers = yf.Tickers(' '.join(prices.columns))
+
+  def fetch_mcap(sym):
+    # fast_info re-raises network/parse errors from its own fetches; one
+    # flaky symbol should skip itself, not abort the whole map
+    try:
+      return sym, tickers.tickers[sym].fast_info.get('market_cap')
+    except Exception:
+      return sym, None
+
+  with ThreadPoolExecutor(max_workers=16) as ex:
+    mcaps = dict(ex.map(fetch_mcap, prices.columns))
+
+  # NaN market caps (shares * NaN when a quote quietly fails) are truthy,
+  # so filter with notna as well
+  results = [(sym, mcaps[sym], returns[sym])
+             for sym in prices.columns
+             if pd.notna(mcaps.get(sym)) and mcaps[sym]]
+
+  df = pd.DataFrame(results, columns=['Symbol', 'MarketCap', 'Returns']).set_index('Symbol')
+  df.reset_index().to_feather("market_caps_and_returns.feather", compression="zstd")
+  return df
 
 def plot_sp500_returns_heatmap():
-  df = pd.read_csv("market_caps_and_returns.csv", index_col=0)
+  # A missing or corrupt data file triggers exactly one refetch; a second
+  # failure propagates instead of looping
+  try:
+    df = pd.read_feather("market_caps_and_returns.feather").set_index('Symbol')
+  except Exception:
+    df = get_sp500_data()
   max_abs_return = max(abs(df['Returns'].min()), abs(df['Returns'].max()))
   norm = plt.Normalize(-max_abs_return, max_abs_return)
-  colors = [plt.cm.RdBu(norm(x)) for x in df['Returns']]
+  # norm and the colormap both accept arrays, so map all rows in one call
+  colors = plt.cm.RdBu(norm(df['Returns'].values))
 
   squarify.plot(
     sizes=df['MarketCap'],
@@ -17,4 +72,4 @@ def plot_sp500_returns_heatmap():
   plt.show()
 
 
-plot_sp500_returns_heatmap()
\ No newline at end of file
+plot_sp500_returns_heatmap()
@@ -1,18 +1,36 @@
-import yfinance as yf
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg')  # headless; never load a GUI backend
 import io
 import base64
 import argparse
 import sys
 from datetime import datetime, timedelta
+from functools import lru_cache
 
+from data_cache import cached_download
+
+# One Figure/Axes pair reused across calls: figure construction (axes,
+# transforms, font caches) costs ~100ms that warm calls can skip
+_FIG = None
+_AX = None
+
+def _get_figure():
+    global _FIG, _AX
+    if _FIG is None:
+        # pyplot costs ~250ms to import; only pay it when plotting
+        import matplotlib.pyplot as plt
+        _FIG, _AX = plt.subplots(figsize=(12, 6))
+    return _FIG, _AX
+
+@lru_cache(maxsize=1)
 def get_default_dates():
     end_date = datetime.now().strftime("%Y-%m-%d")
     start_date = (datetime.now() - timedelta(days=5*365)).strftime("%Y-%m-%d")
     return start_date, end_date
 
+@lru_cache(maxsize=1024)
 def format_crypto_symbol(symbol: str) -> str:
     """Format cryptocurrency symbols for yfinance."""
     # Common cryptocurrency mappings
@@ -58,66 +76,76 @@ def simulate(stock: str, growth_rate: float, start_date: str = None, end_date: s
     Returns:
       str: Base64-encoded image string if visualize is True; otherwise, returns an empty string.
     """
-    start_date = start_date or get_default_dates()[0]
-    end_date = end_date or get_default_dates()[1]
+    if start_date is None or end_date is None:
+        default_start, default_end = get_default_dates()
+        start_date = start_date or default_start
+        end_date = end_date or default_end
     
     # Format the symbol if it's a cryptocurrency
     formatted_symbol = format_crypto_symbol(stock)
     
     try:
         # Fetch historical closing prices for the given stock/crypto
-        df = yf.download(formatted_symbol, start=start_date, end=end_date)
+        df = cached_download([formatted_symbol], start=start_date, end=end_date)
         if df.empty:
             raise ValueError(f"No data found for ticker {formatted_symbol}")
-        
+
         # Extract closing prices and ensure index is datetime
-        actual_prices = df['Close']
+        actual_prices = df[formatted_symbol]
         dates = actual_prices.index
         
         # Get initial price for simulation
         initial_price = actual_prices.iloc[0]
         
         # Calculate days elapsed as float values
-        start_date = dates[0]
-        days_elapsed = [(date - start_date).days for date in dates]
-        
-        # Calculate growth factor for each day
+        days = (dates - dates[0]).days.to_numpy(dtype=np.float64)
+
+        # Compound the growth factor over elapsed days in one vectorized pass
         annual_factor = 1 + (growth_rate / 100)
-        daily_factors = [annual_factor ** (day / 365) for day in days_elapsed]
-        
-        # Calculate simulated prices
-        simulated_prices = [initial_price * factor for factor in daily_factors]
+        if days.size and np.all(np.diff(days) == 1):
+            # Evenly spaced daily data (e.g. crypto): one pow for the daily
+            # factor, then a cumulative product of multiplies instead of a
+            # libm pow per element
+            daily_factor = annual_factor ** (1.0 / 365.0)
+            factors = np.cumprod(np.concatenate(([1.0], np.full(days.size - 1, daily_factor))))
+            simulated_prices = initial_price * factors
+        else:
+            # Irregular spacing (weekends/holidays): general pow path
+            simulated_prices = initial_price * np.power(annual_factor, days / 365.0)
         
         if visualize:
-            plt.figure(figsize=(12, 6))
-            
+            from matplotlib.ticker import FuncFormatter
+
+            fig, ax = _get_figure()
+            ax.clear()
+
             # Plot actual prices
-            plt.plot(dates, actual_prices.values, 
-                    label=f"Actual Price ({stock})", 
+            ax.plot(dates, actual_prices.values,
+                    label=f"Actual Price ({stock})",
                     color="#8B5CF6")
-            
+
             # Plot simulated prices
-            plt.plot(dates, simulated_prices,
+            ax.plot(dates, simulated_prices,
                     label=f"Simulated Price ({growth_rate}% YoY Growth)",
                     color="#F472B6",
                     linestyle="--")
-            
-            plt.title(f"Actual vs. Simulated Price for {stock}")
-            plt.xlabel("Date")
-            plt.ylabel("Price")
-            plt.legend()
-            plt.grid(True, alpha=0.3)
-            
+
+            ax.set_title(f"Actual vs. Simulated Price for {stock}")
+            ax.set_xlabel("Date")
+            ax.set_ylabel("Price")
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+
             # Format y-axis with commas for thousands
-            plt.gca().yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: format(int(x), ',')))
-            
-            # Save plot to buffer
+            ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: format(int(x), ',')))
+
+            # Save plot to buffer; the figure stays open for the next call
             buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', bbox_inches='tight', dpi=300)
+            fig.savefig(buffer, format='png', bbox_inches='tight', dpi=150,
+                        pil_kwargs={'optimize': True, 'compress_level': 6})
             buffer.seek(0)
             image_base64 = base64.b64encode(buffer.getvalue()).decode()
-            plt.close()
-            
+
             return image_base64
         else:
             return ""